@@ -1,8 +1,12 @@
 import sys, random, math, signal, json, subprocess, shutil, re, os
+from bisect import bisect_left
+from collections import OrderedDict
 from pathlib import Path
 from PySide6.QtWidgets import QApplication, QWidget, QSystemTrayIcon, QMenu, QFileDialog
-from PySide6.QtCore import Qt, QTimer, QPointF
-from PySide6.QtGui import QPainter, QColor, QFont, QFontMetrics, QIcon, QAction
+from PySide6.QtCore import Qt, QTimer, QPointF, QRectF, QSizeF
+from PySide6.QtGui import QPainter, QColor, QFont, QFontMetrics, QIcon, QAction, QImage, QPixmap
+try: from PySide6.QtSvg import QSvgRenderer
+except ImportError: QSvgRenderer = None
 
 def strip_json_comments(json_str):
     json_str = re.sub(r'/\*[\s\S]*?\*/', '', json_str)
@@ -20,12 +24,15 @@ def strip_json_comments(json_str):
     return '\n'.join(cleaned)
 
 DEFAULT_CONFIG_JSONC = """{
-  // Display type: "symbol" or "circle"
+  // Display type: "symbol", "circle" or "image"
   "display_type": "symbol",
 
   // Symbols for snowflakes. Can be unicode symbols or emoji (note: using emoji is resource-heavy). Used when "display_type": "symbol".
   "symbols": ["❄", "❆", "❇", "*", "·"],
 
+  // PNG/SVG files for snowflakes, relative to the config file or absolute. Used when "display_type": "image".
+  "images": [],
+
   "count": 150,
 
   "min_size": 10,
@@ -131,9 +138,10 @@ def parse_color(col):
     return QColor(255,255,255,220)
 
 class SnowflakeConfig:
-    def __init__(self, cfg=None):
+    def __init__(self, cfg=None, base_dir=None):
         cfg = cfg or json.loads(strip_json_comments(DEFAULT_CONFIG_JSONC))
         for k,v in cfg.items(): setattr(self, k.upper(), v)
+        self.base_dir = base_dir or Path(__file__).parent.absolute()
         self._normalize()
 
     def _normalize(self):
@@ -145,6 +153,9 @@ class SnowflakeConfig:
                 except: pass
         self.COLORS = colors or [QColor(255,255,255,220)]
 
+        images = self.IMAGES if hasattr(self,'IMAGES') and isinstance(self.IMAGES,list) else []
+        self.IMAGES = list(dict.fromkeys(str(self.base_dir/Path(i).expanduser()) for i in images if isinstance(i,str) and i))
+
         if not hasattr(self, 'ROTATION_ENABLED'):
             self.ROTATION_ENABLED = True
         if not hasattr(self, 'MIN_ROT_SPEED'):
@@ -170,7 +181,7 @@ def load_config(path):
         if not path: return SnowflakeConfig()
         content = path.read_text(encoding='utf-8')
         parsed = json.loads(strip_json_comments(content))
-        return SnowflakeConfig(parsed)
+        return SnowflakeConfig(parsed, path.parent)
     except Exception as e:
         error_msg = f"Config load error: {e}. Using default."
         print(error_msg)
@@ -337,6 +348,10 @@ def parse_args():
     p.add_argument('--add-as-app', action='store_true', help='Create desktop entry')
     return p.parse_args()
 
+def pick_shape(cfg):
+    if cfg.DISPLAY_TYPE == "image" and cfg.IMAGES: return random.choice(cfg.IMAGES)
+    return random.choice(cfg.SYMBOLS) if cfg.SYMBOLS else "❄"
+
 class Snowflake:
     __slots__ = ('x','y','size','speed','wobble','rotation','rot_speed','symbol','color','wind_off')
     def __init__(self, w, h, cfg):
@@ -349,9 +364,190 @@ class Snowflake:
         else:
             self.rot_speed = 0
         self.wind_off = random.uniform(0,math.pi*2)
-        self.symbol = random.choice(cfg.SYMBOLS) if cfg.SYMBOLS else "❄"
+        self.symbol = pick_shape(cfg)
         self.color = random.choice(cfg.COLORS)
 
+GLYPH_CACHE_LIMIT = 1024
+IMAGE_CACHE_BYTES = 64*1024*1024
+PREWARM_BATCH = 32
+IMAGE_PREWARM_BATCH = 1
+
+def quantize_size(sz): return max(1, int(round(sz)))
+
+def size_buckets(lo, hi, n):
+    if n >= hi-lo+1: return list(range(lo, hi+1))
+    if n <= 1: return [hi]
+    return sorted({int(round(lo*(hi/lo)**(i/(n-1)))) for i in range(n)})
+
+def is_svg(path): return path.lower().endswith(".svg")
+
+class LRUCache:
+    """Cost-bounded LRU over size buckets; subclasses implement _build(key) and _warm_keys(cfg)."""
+    warm_batch = PREWARM_BATCH
+
+    def __init__(self, limit):
+        self.limit, self.used, self.entries = limit, 0, OrderedDict()
+        self.hits = self.misses = 0
+        self.buckets, self._bucket_of = [1], {}
+        self._warm_queue = []; self._warm_timer = None; self._truncation_logged = False
+
+    def _cost(self, entry): return 1
+    def _bucket_cost(self, px): return 1
+    def _usage(self): return f"{len(self.entries)}/{self.limit} entries"
+
+    def bucket(self, sz):
+        px = quantize_size(sz)
+        b = self._bucket_of.get(px)
+        return b if b is not None else min(self.buckets, key=lambda c: abs(c-px))
+
+    def plan_buckets(self, lo, hi, assets):
+        # Coarsen sizes until assets x buckets fits the cap; flakes are scaled to their exact size when drawn
+        lo, hi = sorted((quantize_size(lo), quantize_size(hi)))
+        n = hi-lo+1; buckets = size_buckets(lo, hi, n)
+        while n > 1 and assets*sum(map(self._bucket_cost, buckets)) > self.limit:
+            n = n-1 if n <= 8 else n*7//8; buckets = size_buckets(lo, hi, n)
+        self.buckets = buckets; self._bucket_of = {}
+        for px in range(lo, hi+1):
+            i = bisect_left(buckets, px)
+            near = buckets[max(0, i-1):i+1]
+            self._bucket_of[px] = min(near, key=lambda c: abs(c-px))
+
+    def _lookup(self, key):
+        if key in self.entries:
+            self.hits += 1; self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        return self._insert(key)
+
+    def _insert(self, key):
+        entry = self.entries[key] = self._build(key); self.used += self._cost(entry)
+        while self.used > self.limit and len(self.entries) > 1:
+            self.used -= self._cost(self.entries.popitem(last=False)[1])
+        return entry
+
+    def discard(self, keys):
+        for key in keys: self.used -= self._cost(self.entries.pop(key))
+
+    def prewarm(self, cfg, parent=None):
+        # Fill the cache in small batches from the event loop so startup/reload never blocks a frame
+        self._warm_queue, budget = [], self.limit
+        for key in self._warm_keys(cfg):
+            budget -= self._bucket_cost(key[1])
+            if budget < 0:
+                if not self._truncation_logged:
+                    print(f"{type(self).__name__}: configured sizes exceed the cache limit, warming a subset")
+                    self._truncation_logged = True
+                break
+            self._warm_queue.append(key)
+        if not self._warm_queue: return
+        if self._warm_timer is None:
+            self._warm_timer = QTimer(parent); self._warm_timer.timeout.connect(self._warm_step)
+        self._warm_timer.start(0)
+
+    def _warm_step(self):
+        batch, self._warm_queue = self._warm_queue[:self.warm_batch], self._warm_queue[self.warm_batch:]
+        for key in batch:
+            if key not in self.entries: self._insert(key)
+        if not self._warm_queue: self._warm_timer.stop()
+
+    def stats(self):
+        total = self.hits + self.misses
+        rate = self.hits/total*100 if total else 0.0
+        return f"{self._usage()}, {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate)"
+
+class GlyphCache(LRUCache):
+    """(QFont, width, height, descent) keyed by (symbol, bucket pixel size)."""
+    def __init__(self, limit=GLYPH_CACHE_LIMIT): super().__init__(limit)
+
+    def get(self, sym, px): return self._lookup((sym, px))
+
+    def _build(self, key):
+        sym, px = key
+        f = QFont(); f.setPixelSize(px)
+        m = QFontMetrics(f); r = m.boundingRect(sym)
+        return (f, r.width(), r.height(), m.descent())
+
+    def _warm_keys(self, cfg):
+        self.plan_buckets(cfg.MIN_SIZE, cfg.MAX_SIZE, max(1, len(cfg.SYMBOLS)))
+        if cfg.DISPLAY_TYPE in ("circle", "image"): return []
+        return [(sym, px) for px in self.buckets for sym in (cfg.SYMBOLS or ["❄"])]
+
+class ImageCache(LRUCache):
+    """Pre-rasterized QPixmap keyed by (image path, bucket pixel size, device pixel ratio), bounded by bytes."""
+    warm_batch = IMAGE_PREWARM_BATCH
+
+    def __init__(self, limit=IMAGE_CACHE_BYTES):
+        super().__init__(limit)
+        self.sources = {}; self.dpr = 1.0; self.max_dev = 1
+
+    def _cost(self, pm): return pm.width()*pm.height()*4 if pm is not None else 0
+    def _bucket_cost(self, px): return math.ceil(px*self.dpr)**2*4
+    def _usage(self): return f"{len(self.entries)} pixmaps, {self.used/2**20:.1f}/{self.limit/2**20:.0f} MiB"
+
+    def get(self, path, px):
+        # Sources are decoded only by the warm-up queue; until then the flake is simply not drawn
+        src = self.sources.get(path, (False, None))[0]
+        if src is None or src is False: return None
+        return self._lookup((path, px, self.dpr))
+
+    def source(self, path):
+        src, sig = self.sources[path]
+        if src is None:
+            try: src = self.load_source(path)
+            except Exception as e: print(f"Image skipped: {e}"); src = False
+            self.sources[path] = (src, sig)
+        return src
+
+    def load_source(self, path):
+        if is_svg(path):
+            if QSvgRenderer is None: raise RuntimeError("SVG support requires PySide6.QtSvg")
+            src = QSvgRenderer(path)
+            if not src.isValid(): raise RuntimeError(f"cannot load image: {path}")
+            return src
+        src = QImage(path)
+        if src.isNull(): raise RuntimeError(f"cannot load image: {path}")
+        # Keep only what the largest flake needs so per-size rescales stay cheap and memory stays small
+        if max(src.width(), src.height()) > self.max_dev:
+            src = src.scaled(self.max_dev, self.max_dev, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return src
+
+    def _build(self, key):
+        path, px, dpr = key
+        src = self.source(path); dev = max(1, int(round(px*dpr)))
+        if src is False: return None
+        if is_svg(path):
+            img = QImage(dev, dev, QImage.Format_ARGB32_Premultiplied); img.fill(Qt.transparent)
+            box = QSizeF(src.defaultSize()).scaled(dev, dev, Qt.KeepAspectRatio)
+            p = QPainter(img); p.setRenderHint(QPainter.Antialiasing)
+            src.render(p, QRectF((dev-box.width())/2, (dev-box.height())/2, box.width(), box.height())); p.end()
+        else:
+            img = src.scaled(dev, dev, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        pm = QPixmap.fromImage(img); pm.setDevicePixelRatio(dpr)
+        return pm
+
+    def _warm_keys(self, cfg):
+        if cfg.DISPLAY_TYPE != "image" or not cfg.IMAGES: return []
+        self.plan_buckets(cfg.MIN_SIZE, cfg.MAX_SIZE, len(cfg.IMAGES))
+        return [(path, px, self.dpr) for px in self.buckets for path in cfg.IMAGES]
+
+    def sync(self, cfg, dpr):
+        # Track sources for the current config only; reuse unchanged files, drop everything else
+        self.dpr = dpr
+        self.max_dev = max(1, math.ceil(quantize_size(cfg.MAX_SIZE)*dpr))
+        old, self.sources, ok = self.sources, {}, []
+        for path in (cfg.IMAGES if cfg.DISPLAY_TYPE == "image" else []):
+            try: st = os.stat(path)
+            except OSError as e: print(f"Image skipped: {e}"); continue
+            sig = (st.st_mtime_ns, st.st_size, self.max_dev)
+            self.sources[path] = old[path] if path in old and old[path][1] == sig else (None, sig)
+            ok.append(path)
+        self.discard([k for k in self.entries if k[2] != dpr or old.get(k[0]) is not self.sources.get(k[0])])
+        if cfg.DISPLAY_TYPE != "image": return
+        cfg.IMAGES = ok
+        if not ok:
+            print("No usable images, falling back to symbols")
+            cfg.DISPLAY_TYPE = "symbol"
+
 def open_kate(file):
     try:
         subprocess.Popen(["kate",str(file)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
@@ -365,12 +561,13 @@ class SnowWidget(QWidget):
         super().__init__()
         self.cfg, self.tray, self.cfg_path, self.snow_enabled = cfg, tray, cfg_path, True
         self.terminal_only = terminal_only
-        self.symbol_cache = {}; self.snowflakes = []
+        self.glyph_cache = GlyphCache(); self.image_cache = ImageCache(); self.snowflakes = []
+        self._stats_reported = False
         self.setWindowFlags(Qt.BypassWindowManagerHint|Qt.FramelessWindowHint|Qt.WindowStaysOnTopHint|Qt.WindowTransparentForInput)
         self.setAttribute(Qt.WA_TranslucentBackground); self.setWindowTitle("KSnow")
         screen = QApplication.primaryScreen().geometry()
         self.setGeometry(screen); self.w, self.h = screen.width(), screen.height()
-        self.snowflakes = [Snowflake(self.w, self.h, cfg) for _ in range(cfg.COUNT)]
+        self.spawn_snow()
         self.timer = QTimer(self); self.timer.timeout.connect(self.update_snow); self.timer.start(16)
         self.show()
 
@@ -387,6 +584,11 @@ class SnowWidget(QWidget):
             else:
                 print("Warning: KWin rule is not installed. Use --install-kwin-rule to install it.")
 
+    def spawn_snow(self):
+        self.image_cache.sync(self.cfg, self.devicePixelRatioF())
+        self.snowflakes = [Snowflake(self.w, self.h, self.cfg) for _ in range(self.cfg.COUNT)]
+        self.glyph_cache.prewarm(self.cfg, self); self.image_cache.prewarm(self.cfg, self)
+
     def toggle_snow(self):
         self.snow_enabled = not self.snow_enabled
         if self.snow_enabled:
@@ -405,7 +607,7 @@ class SnowWidget(QWidget):
     def load_config(self, path):
         try:
             self.cfg = load_config(path); self.cfg_path = path
-            self.snowflakes = [Snowflake(self.w, self.h, self.cfg) for _ in range(self.cfg.COUNT)]
+            self.spawn_snow()
             print(f"Loaded: {path}")
             if not self.terminal_only:
                 show_notification("KSnow",f"Loaded: {path.name}","dialog-information")
@@ -427,7 +629,7 @@ class SnowWidget(QWidget):
             self.load_config(default)
         else:
             self.cfg = SnowflakeConfig(); self.cfg_path = None
-            self.snowflakes = [Snowflake(self.w,self.h,self.cfg) for _ in range(self.cfg.COUNT)]
+            self.spawn_snow()
             print("Using built-in default")
             self.update_menu()
 
@@ -484,14 +686,6 @@ class SnowWidget(QWidget):
                 elif action.text() == "Reload current config":
                     action.setVisible(not is_default_config)
 
-    def get_metrics(self, sym, sz):
-        key = (sym, sz)
-        if key not in self.symbol_cache:
-            f = QFont(); f.setPixelSize(int(sz))
-            m = QFontMetrics(f); r = m.boundingRect(sym)
-            self.symbol_cache[key] = (r.width(), r.height(), m.descent())
-        return self.symbol_cache[key]
-
     def update_snow(self):
         if not self.snow_enabled: return
         for f in self.snowflakes:
@@ -503,7 +697,7 @@ class SnowWidget(QWidget):
             f.x += math.sin(f.y/self.cfg.WOBBLE_FREQUENCY) * self.cfg.WOBBLE_AMPLITUDE
             if f.y > self.h:
                 f.y = random.randint(-100,-10); f.x = random.randint(0,self.w)
-                f.symbol = random.choice(self.cfg.SYMBOLS) if self.cfg.SYMBOLS else "❄"
+                f.symbol = pick_shape(self.cfg)
                 f.color = random.choice(self.cfg.COLORS); f.speed = random.uniform(self.cfg.MIN_SPEED, self.cfg.MAX_SPEED)
         self.update()
 
@@ -513,22 +707,41 @@ class SnowWidget(QWidget):
             p.fillRect(self.rect(), self.cfg.BACKGROUND_COLOR)
             return
 
+        if self.cfg.DISPLAY_TYPE == "image" and self.devicePixelRatioF() != self.image_cache.dpr:
+            # Moved to another screen or the scale factor changed: re-rasterize for the new ratio
+            self.image_cache.sync(self.cfg, self.devicePixelRatioF()); self.image_cache.prewarm(self.cfg, self)
+
         p = QPainter(self); p.setRenderHint(QPainter.Antialiasing)
+        if self.cfg.DISPLAY_TYPE == "image": p.setRenderHint(QPainter.SmoothPixmapTransform)
         p.fillRect(self.rect(), self.cfg.BACKGROUND_COLOR)
         for f in self.snowflakes:
             p.save(); p.setPen(f.color)
             if self.cfg.DISPLAY_TYPE == "circle":
                 p.setBrush(f.color); p.drawEllipse(QPointF(f.x, f.y), f.size/2, f.size/2)
+            elif self.cfg.DISPLAY_TYPE == "image":
+                pm = self.image_cache.get(f.symbol, self.image_cache.bucket(f.size))
+                if pm is not None:
+                    p.translate(f.x, f.y)
+                    if self.cfg.ROTATION_ENABLED:
+                        p.rotate(f.rotation)
+                    sz = pm.deviceIndependentSize(); k = f.size/max(sz.width(), sz.height())
+                    p.drawPixmap(QRectF(-sz.width()*k/2, -sz.height()*k/2, sz.width()*k, sz.height()*k), pm, QRectF(pm.rect()))
             else:
-                font = QFont(); font.setPixelSize(int(f.size)); p.setFont(font)
+                b = self.glyph_cache.bucket(f.size)
+                font, w, h, d = self.glyph_cache.get(f.symbol, b); p.setFont(font)
                 p.translate(f.x, f.y)
                 if self.cfg.ROTATION_ENABLED:
                     p.rotate(f.rotation)
-                w, h, d = self.get_metrics(f.symbol, f.size)
+                p.scale(f.size/b, f.size/b)
                 p.drawText(QPointF(-w/2, h/2 - d), f.symbol)
             p.restore()
 
-    def close_app(self): self.timer.stop(); self.close()
+    def report_cache_stats(self):
+        if self._stats_reported: return
+        self._stats_reported = True
+        print(f"Glyph cache: {self.glyph_cache.stats()}; image cache: {self.image_cache.stats()}")
+
+    def close_app(self): self.timer.stop(); self.report_cache_stats(); self.close()
 
 def signal_handler(s, f):
     for w in QApplication.topLevelWidgets():
@@ -658,6 +871,7 @@ def main():
         tray.setContextMenu(menu); tray.show()
 
     win = SnowWidget(cfg, tray, cfg_path, TERMINAL_ONLY_MODE)
+    app.aboutToQuit.connect(win.report_cache_stats)
 
     if tray:
         tray.activated.connect(lambda r: win.toggle_snow() if r == QSystemTrayIcon.ActivationReason.Trigger else None)